@@ -1,4 +1,4 @@
-from lophat import compute_pairings, compute_pairings_serial
+from lophat import LoPhatOptions, compute_pairings, compute_pairings_serial
 
 # Note that I don't tell lophat what dimension my columns are
 matrix = [
@@ -19,7 +19,12 @@ matrix = [
 ]
 
 # Note we pass iter(matrix)
-dgm_par = compute_pairings(iter(matrix))
+# Providing column_height lets lophat pick a bitmap column representation
+# for short columns, so additions become word-wise XORs.
+# num_threads is left at its default here: extra threads buy little when a
+# single dimension block dominates the reduction.
+opts = LoPhatOptions(column_height=len(matrix))
+dgm_par = compute_pairings(iter(matrix), opts)
 dgm_serial = compute_pairings_serial(iter(matrix))
 
 print("Parallel:")
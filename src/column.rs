@@ -1,4 +1,11 @@
-use std::cmp::Ordering;
+use std::cell::RefCell;
+use std::mem;
+
+thread_local! {
+    // Reused across every add_col on the thread, so the merge result
+    // does not need a fresh allocation per column addition.
+    static MERGE_SCRATCH: RefCell<Vec<usize>> = RefCell::new(Vec::with_capacity(256));
+}
 
 /// Structs implementing `Column` represent columns of a `usize`-indexed matrix,
 /// over the field F_2.
@@ -10,6 +17,11 @@ pub trait Column: Sync + Clone + Send + Default {
     /// Should be equivalent to `self.add_col(e_entry)` where `e_entry` is the column
     /// with all zeros except a 1 in index `entry`.
     fn add_entry(&mut self, entry: usize);
+    /// Estimate of this column's memory footprint in bytes,
+    /// used to size cache-resident work chunks.
+    fn mem_bytes(&self) -> usize {
+        std::mem::size_of_val(self)
+    }
 }
 
 /// A [`Column`]-implementing struct, representing the column by an increasing vector of the non-zero indices.
@@ -20,46 +32,48 @@ pub struct VecColumn {
     pub internal: Vec<usize>,
 }
 
-impl VecColumn {
-    // Returns the index where we should try to insert next entry
-    fn add_entry_starting_at(&mut self, entry: usize, starting_idx: usize) -> usize {
-        let mut working_idx = starting_idx;
-        while let Some(value_at_idx) = self.internal.iter().nth(working_idx) {
-            match value_at_idx.cmp(&entry) {
-                Ordering::Less => {
-                    working_idx += 1;
-                    continue;
-                }
-                Ordering::Equal => {
-                    self.internal.remove(working_idx);
-                    return working_idx;
-                }
-                Ordering::Greater => {
-                    self.internal.insert(working_idx, entry);
-                    return working_idx + 1;
-                }
-            }
-        }
-        // Bigger than all idxs in col - add to end
-        self.internal.push(entry);
-        return self.internal.len() - 1;
-    }
-}
-
 impl Column for VecColumn {
     fn pivot(&self) -> Option<usize> {
         self.internal.iter().last().copied()
     }
 
     fn add_entry(&mut self, entry: usize) {
-        self.add_entry_starting_at(entry, 0);
+        match self.internal.binary_search(&entry) {
+            Ok(idx) => {
+                self.internal.remove(idx);
+            }
+            Err(idx) => self.internal.insert(idx, entry),
+        }
     }
 
     fn add_col(&mut self, other: &Self) {
-        let mut working_idx = 0;
-        for entry in other.internal.iter() {
-            working_idx = self.add_entry_starting_at(*entry, working_idx);
-        }
+        MERGE_SCRATCH.with(|scratch| {
+            let mut scratch = scratch.borrow_mut();
+            let (this, that) = (&self.internal, &other.internal);
+            scratch.clear();
+            scratch.resize(this.len() + that.len(), 0);
+            let (mut i, mut j, mut out) = (0, 0, 0);
+            while i < this.len() && j < that.len() {
+                let (left, right) = (this[i], that[j]);
+                // Branchless select-and-advance; whether the next entry comes
+                // from the left or right run is data-dependent and hence
+                // unpredictable, so we let the compiler lower this to cmov
+                // rather than eat a mispredict per merged entry. Equal
+                // entries cancel over F_2: both cursors advance, out doesn't.
+                scratch[out] = if left < right { left } else { right };
+                out += (left != right) as usize;
+                i += (left <= right) as usize;
+                j += (left >= right) as usize;
+            }
+            scratch.truncate(out);
+            scratch.extend_from_slice(&this[i..]);
+            scratch.extend_from_slice(&that[j..]);
+            mem::swap(&mut *scratch, &mut self.internal);
+        });
+    }
+
+    fn mem_bytes(&self) -> usize {
+        mem::size_of_val(self) + self.internal.capacity() * mem::size_of::<usize>()
     }
 }
 
@@ -70,3 +84,149 @@ impl From<Vec<usize>> for VecColumn {
         Self { internal }
     }
 }
+
+/// A [`Column`]-implementing struct, representing the column as a bitmap
+/// of its non-zero indices, packed into 64-bit words.
+///
+/// Column addition is a word-wise XOR, which is branch-free and autovectorizes,
+/// at the cost of storing the full column height.
+/// Hence this representation is best suited to columns of small height
+/// (a few hundred rows).
+///
+/// To construct call [`BitsetColumn::from`].
+#[derive(Debug, Default, Clone)]
+pub struct BitsetColumn {
+    words: Vec<u64>,
+}
+
+impl Column for BitsetColumn {
+    fn pivot(&self) -> Option<usize> {
+        let (word_idx, word) = self
+            .words
+            .iter()
+            .enumerate()
+            .rev()
+            .find(|(_, &word)| word != 0)?;
+        Some(word_idx * 64 + 63 - word.leading_zeros() as usize)
+    }
+
+    fn add_entry(&mut self, entry: usize) {
+        let word_idx = entry / 64;
+        if self.words.len() <= word_idx {
+            self.words.resize(word_idx + 1, 0);
+        }
+        self.words[word_idx] ^= 1 << (entry % 64);
+    }
+
+    fn add_col(&mut self, other: &Self) {
+        if self.words.len() < other.words.len() {
+            self.words.resize(other.words.len(), 0);
+        }
+        for (word, other_word) in self.words.iter_mut().zip(other.words.iter()) {
+            *word ^= other_word;
+        }
+    }
+
+    fn mem_bytes(&self) -> usize {
+        mem::size_of_val(self) + self.words.capacity() * mem::size_of::<u64>()
+    }
+}
+
+impl From<Vec<usize>> for BitsetColumn {
+    /// Constructs a `BitsetColumn` from the vector of non-zero indices.
+    fn from(entries: Vec<usize>) -> Self {
+        let mut column = Self::default();
+        for entry in entries {
+            column.add_entry(entry);
+        }
+        column
+    }
+}
+
+/// A [`Column`]-implementing struct, representing the column as a bitmap
+/// with a compile-time fixed number of 64-bit words.
+///
+/// Since the word count is a const generic, columns live inline (no heap
+/// indirection) and the XOR loop in `add_col` fully unrolls.
+/// All entries must lie in `0..64 * W`.
+///
+/// To construct call [`ArrayBitsetColumn::from`].
+#[derive(Debug, Clone)]
+pub struct ArrayBitsetColumn<const W: usize> {
+    words: [u64; W],
+}
+
+impl<const W: usize> Default for ArrayBitsetColumn<W> {
+    fn default() -> Self {
+        Self { words: [0; W] }
+    }
+}
+
+impl<const W: usize> Column for ArrayBitsetColumn<W> {
+    fn pivot(&self) -> Option<usize> {
+        let (word_idx, word) = self
+            .words
+            .iter()
+            .enumerate()
+            .rev()
+            .find(|(_, &word)| word != 0)?;
+        Some(word_idx * 64 + 63 - word.leading_zeros() as usize)
+    }
+
+    fn add_entry(&mut self, entry: usize) {
+        self.words[entry / 64] ^= 1 << (entry % 64);
+    }
+
+    fn add_col(&mut self, other: &Self) {
+        for word_idx in 0..W {
+            self.words[word_idx] ^= other.words[word_idx];
+        }
+    }
+}
+
+impl<const W: usize> From<Vec<usize>> for ArrayBitsetColumn<W> {
+    /// Constructs an `ArrayBitsetColumn` from the vector of non-zero indices.
+    fn from(entries: Vec<usize>) -> Self {
+        let mut column = Self::default();
+        for entry in entries {
+            column.add_entry(entry);
+        }
+        column
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use proptest::collection::hash_set;
+    use proptest::prelude::*;
+
+    fn sorted_vec(set: std::collections::HashSet<usize>) -> Vec<usize> {
+        let mut vec: Vec<_> = set.into_iter().collect();
+        vec.sort();
+        vec
+    }
+
+    fn bitset_entries(col: &BitsetColumn, height: usize) -> Vec<usize> {
+        (0..height)
+            .filter(|entry| col.words.get(entry / 64).copied().unwrap_or(0) & (1 << (entry % 64)) != 0)
+            .collect()
+    }
+
+    proptest! {
+        #[test]
+        fn bitset_agrees_with_vec(
+            first in hash_set(0..512usize, 0..64),
+            second in hash_set(0..512usize, 0..64),
+        ) {
+            let (first, second) = (sorted_vec(first), sorted_vec(second));
+            let mut vec_col = VecColumn::from(first.clone());
+            let mut bit_col = BitsetColumn::from(first);
+            prop_assert_eq!(vec_col.pivot(), bit_col.pivot());
+            vec_col.add_col(&VecColumn::from(second.clone()));
+            bit_col.add_col(&BitsetColumn::from(second));
+            prop_assert_eq!(vec_col.pivot(), bit_col.pivot());
+            prop_assert_eq!(vec_col.internal, bitset_entries(&bit_col, 512));
+        }
+    }
+}
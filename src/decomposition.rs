@@ -1,8 +1,11 @@
 use crate::Column;
 use hashbrown::HashSet;
+use numpy::{IntoPyArray, PyArray1, PyArray2};
 use pyo3::prelude::*;
 use rayon::prelude::*;
-use std::collections::HashMap;
+// The pivot keys are trusted column indices, so we prefer FxHash's speed on
+// small integer keys over SipHash's DoS resistance.
+use rustc_hash::FxHashMap;
 
 /// Stores the pairings from a matrix decomposition,
 /// as well as those columns which did not appear in a pairing.
@@ -15,6 +18,51 @@ pub struct PersistenceDiagram {
     pub paired: HashSet<(usize, usize)>,
 }
 
+#[pymethods]
+impl PersistenceDiagram {
+    /// The pairings as a lexicographically sorted `(n, 2)` int64 array.
+    /// Deterministic ordering means two diagrams can be compared with
+    /// `np.array_equal`, without boxing every pair back into Python ints.
+    #[getter]
+    fn paired_array<'py>(&self, py: Python<'py>) -> &'py PyArray2<i64> {
+        let mut pairs: Vec<(usize, usize)> = self.paired.iter().copied().collect();
+        pairs.sort_unstable();
+        let flat: Vec<i64> = pairs
+            .iter()
+            .flat_map(|&(birth, death)| [birth as i64, death as i64])
+            .collect();
+        PyArray1::from_vec(py, flat)
+            .reshape([pairs.len(), 2])
+            .expect("Pairs reshape to (n, 2)")
+    }
+
+    /// The unpaired columns as a sorted int64 array.
+    #[getter]
+    fn unpaired_array<'py>(&self, py: Python<'py>) -> &'py PyArray1<i64> {
+        let mut unpaired: Vec<i64> = self.unpaired.iter().map(|&idx| idx as i64).collect();
+        unpaired.sort_unstable();
+        unpaired.into_pyarray(py)
+    }
+}
+
+impl PersistenceDiagram {
+    /// Re-indexes the diagram of the anti-transpose of a square matrix with
+    /// `num_cols` columns back into the indexing of the original matrix.
+    pub fn anti_transpose(self, num_cols: usize) -> Self {
+        let unpaired = self
+            .unpaired
+            .into_iter()
+            .map(|idx| num_cols - 1 - idx)
+            .collect();
+        let paired = self
+            .paired
+            .into_iter()
+            .map(|(birth, death)| (num_cols - 1 - death, num_cols - 1 - birth))
+            .collect();
+        PersistenceDiagram { unpaired, paired }
+    }
+}
+
 /// Stores the matrices R and V resulting from and R=DV decomposition as vectors of structs implementing [`Column`].
 #[derive(Debug, Default)]
 pub struct RVDecomposition<C: Column> {
@@ -22,7 +70,7 @@ pub struct RVDecomposition<C: Column> {
     pub v: Vec<C>,
 }
 
-fn col_idx_with_same_low<C: Column>(col: &C, low_inverse: &HashMap<usize, usize>) -> Option<usize> {
+fn col_idx_with_same_low<C: Column>(col: &C, low_inverse: &FxHashMap<usize, usize>) -> Option<usize> {
     let pivot = col.pivot()?;
     low_inverse.get(&pivot).copied()
 }
@@ -38,8 +86,8 @@ impl<C: Column> RVDecomposition<C> {
     /// ```ignore
     /// low_inverse.get(&self.r[j].pivot().unwrap()) == j
     /// ```
-    /// If you pass the same `HashMap` into `reduce_column` every time, it will maintain this map.
-    pub fn reduce_column(&mut self, mut column: C, low_inverse: &mut HashMap<usize, usize>) {
+    /// If you pass the same `FxHashMap` into `reduce_column` every time, it will maintain this map.
+    pub fn reduce_column(&mut self, mut column: C, low_inverse: &mut FxHashMap<usize, usize>) {
         // v_col tracks how the final reduced column is built up
         // Currently column contains 1 lot of the latest column in D
         let mut v_col = C::default();
@@ -85,7 +133,7 @@ impl<C: Column> RVDecomposition<C> {
 ///
 /// * `matrix` - iterator over columns of the matrix you wish to decompose.
 pub fn rv_decompose<C: Column>(matrix: impl Iterator<Item = C>) -> RVDecomposition<C> {
-    let mut low_inverse = HashMap::new();
+    let mut low_inverse = FxHashMap::default();
     matrix.fold(RVDecomposition::default(), |mut accum, next_col| {
         accum.reduce_column(next_col, &mut low_inverse);
         accum
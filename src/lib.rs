@@ -9,35 +9,214 @@
 //!
 //! Both functions return a [`RVDecomposition`], from which you can read off the persistence diagram.
 
+use numpy::PyReadonlyArray1;
 use pyo3::prelude::*;
-use pyo3::types::PyIterator;
+use pyo3::types::{PyIterator, PyList};
 
 mod column;
 mod decomposition;
 mod lock_free;
 mod matrix;
+mod options;
+mod union_find;
 
-pub use column::{Column, VecColumn};
+pub use column::{ArrayBitsetColumn, BitsetColumn, Column, VecColumn};
 pub use decomposition::{rv_decompose, PersistenceDiagram, RVDecomposition};
 pub use lock_free::rv_decompose_lock_free;
 pub use matrix::*;
+pub use options::LoPhatOptions;
+pub use union_find::UnionFind;
 
-fn matrix_from_pyiterator<'a>(matrix: &'a PyIterator) -> impl Iterator<Item = VecColumn> + 'a {
-    matrix.map(|col| {
-        col.and_then(PyAny::extract::<Vec<usize>>)
-            .map(VecColumn::from)
-            .expect("Column is a list of unsigned integers")
-    })
+// Columns no taller than this are reduced as bitmaps rather than index vectors.
+const MAX_BITSET_HEIGHT: usize = 512;
+
+// Reduces the matrix with a column representation picked from the height
+// hint: one of four monomorphized inline-bitmap widths for short columns,
+// or VecColumn when the height is unknown or too large. Keeping the width a
+// compile-time constant fixes the XOR kernel per instantiation.
+fn decompose_and_diagram(
+    columns: impl Iterator<Item = Vec<usize>>,
+    options: LoPhatOptions,
+) -> PersistenceDiagram {
+    match options.column_height {
+        Some(height) if height <= 64 => {
+            rv_decompose_lock_free(columns.map(ArrayBitsetColumn::<1>::from), options).diagram()
+        }
+        Some(height) if height <= 128 => {
+            rv_decompose_lock_free(columns.map(ArrayBitsetColumn::<2>::from), options).diagram()
+        }
+        Some(height) if height <= 256 => {
+            rv_decompose_lock_free(columns.map(ArrayBitsetColumn::<4>::from), options).diagram()
+        }
+        Some(height) if height <= MAX_BITSET_HEIGHT => {
+            rv_decompose_lock_free(columns.map(ArrayBitsetColumn::<8>::from), options).diagram()
+        }
+        _ => rv_decompose_lock_free(columns.map(VecColumn::from), options).diagram(),
+    }
+}
+
+fn extract_column(col: &PyAny) -> Vec<usize> {
+    // Fast path for the common case of a list column: size the Vec from the
+    // known length and fetch items with PyList_GET_ITEM (no per-item bounds
+    // check or intermediate iterator), leaving one integer conversion per
+    // entry as the only Python API traffic.
+    if let Ok(list) = col.downcast::<PyList>() {
+        let mut column = Vec::with_capacity(list.len());
+        for idx in 0..list.len() {
+            // Safety: idx < list.len() and we hold the GIL.
+            let entry = unsafe { list.get_item_unchecked(idx) };
+            column.push(
+                entry
+                    .extract()
+                    .expect("Column entries are unsigned integers"),
+            );
+        }
+        return column;
+    }
+    col.extract()
+        .expect("Column is a sequence of unsigned integers")
+}
+
+fn columns_from_pyiterator<'a>(matrix: &'a PyIterator) -> impl Iterator<Item = Vec<usize>> + 'a {
+    matrix.map(|col| extract_column(col.expect("Failed to read column from iterator")))
 }
 
 #[pyfunction]
 fn compute_pairings_serial(matrix: &PyIterator) -> PersistenceDiagram {
-    rv_decompose(matrix_from_pyiterator(matrix)).diagram()
+    rv_decompose(columns_from_pyiterator(matrix).map(VecColumn::from)).diagram()
+}
+
+// How many extracted columns may sit between the Python iterator and the
+// reduction thread before the producer blocks.
+const STREAM_BUFFER_LEN: usize = 1024;
+
+#[pyfunction]
+#[pyo3(signature = (matrix, options=None))]
+fn compute_pairings(
+    py: Python,
+    matrix: &PyIterator,
+    options: Option<LoPhatOptions>,
+) -> PersistenceDiagram {
+    let options = options.unwrap_or_default();
+    // Extracting columns needs the GIL, but collecting and reducing them
+    // doesn't; stream the columns to a worker thread through a bounded
+    // channel so Python iteration overlaps with the start of the reduction.
+    let (tx, rx) = crossbeam::channel::bounded::<Vec<usize>>(STREAM_BUFFER_LEN);
+    let reducer = std::thread::spawn(move || decompose_and_diagram(rx.into_iter(), options));
+    for col in columns_from_pyiterator(matrix) {
+        tx.send(col).expect("Reduction thread hung up");
+    }
+    drop(tx);
+    py.allow_threads(|| reducer.join().expect("Reduction thread panicked"))
 }
 
+fn columns_from_csr<'a>(
+    indptr: &'a [i64],
+    indices: &'a [i32],
+) -> impl Iterator<Item = Vec<usize>> + 'a {
+    indptr.windows(2).map(move |window| {
+        let col_range = (window[0] as usize)..(window[1] as usize);
+        indices[col_range]
+            .iter()
+            .map(|&entry| entry as usize)
+            .collect::<Vec<usize>>()
+    })
+}
+
+// Computes pairings for a matrix annotated with column dimensions:
+// dimension-0 pairings come from a union-find pass over the dimension-1
+// columns, and only columns of dimension >= 2 are handed to the reducer.
+// Column additions in the standard reduction only ever happen between
+// columns of equal dimension (a dimension-d pivot lies in a (d-1)-cell row),
+// so blanking the low-dimensional block does not disturb the rest.
+fn pairings_with_dims(
+    indptr: &[i64],
+    indices: &[i32],
+    dims: &[i32],
+    options: LoPhatOptions,
+) -> PersistenceDiagram {
+    let num_cols = indptr.len() - 1;
+    let mut union_find = UnionFind::new(num_cols);
+    let mut uf_pairs = vec![];
+    for j in 0..num_cols {
+        if dims[j] != 1 {
+            continue;
+        }
+        let col_range = (indptr[j] as usize)..(indptr[j + 1] as usize);
+        let endpoints = &indices[col_range];
+        assert!(
+            endpoints.len() == 2,
+            "Dimension-1 columns should have exactly two entries"
+        );
+        let merged = union_find.union(endpoints[0] as usize, endpoints[1] as usize);
+        if let Some(dying) = merged {
+            uf_pairs.push((dying, j));
+        }
+    }
+    let columns = (0..num_cols).map(|j| {
+        if dims[j] >= 2 {
+            let col_range = (indptr[j] as usize)..(indptr[j + 1] as usize);
+            indices[col_range]
+                .iter()
+                .map(|&entry| entry as usize)
+                .collect()
+        } else {
+            vec![]
+        }
+    });
+    let mut diagram = decompose_and_diagram(columns, options);
+    // The blanked dimension-0/1 columns all came back unpaired; overlay the
+    // union-find pairings on top.
+    for (birth, death) in uf_pairs {
+        diagram.unpaired.remove(&birth);
+        diagram.unpaired.remove(&death);
+        diagram.paired.insert((birth, death));
+    }
+    diagram
+}
+
+/// Computes pairings from the matrix provided in CSR format,
+/// i.e. the non-zero indices of column `j` are `indices[indptr[j]..indptr[j+1]]`.
+/// The entire matrix crosses the FFI boundary as two borrowed buffers,
+/// avoiding per-column list extraction.
+///
+/// When `anti_transpose` is set, the decomposition runs on the
+/// anti-transpose of the (square) matrix, assembled in one fused pass over
+/// the CSR buffers; the returned diagram is re-indexed to the original
+/// matrix, so the result is the same either way round.
+///
+/// When `dims` annotates each column with its cell dimension, dimension-0
+/// pairings are computed by a union-find pass over the dimension-1 columns
+/// and only higher-dimensional columns go through matrix reduction.
 #[pyfunction]
-fn compute_pairings(matrix: &PyIterator) -> PersistenceDiagram {
-    rv_decompose_lock_free(matrix_from_pyiterator(matrix), None).diagram()
+#[pyo3(signature = (indptr, indices, options=None, anti_transpose=false, dims=None))]
+fn compute_pairings_csr(
+    indptr: PyReadonlyArray1<i64>,
+    indices: PyReadonlyArray1<i32>,
+    options: Option<LoPhatOptions>,
+    anti_transpose: bool,
+    dims: Option<PyReadonlyArray1<i32>>,
+) -> PyResult<PersistenceDiagram> {
+    let options = options.unwrap_or_default();
+    let indptr = indptr.as_slice().expect("indptr is contiguous");
+    let indices = indices.as_slice().expect("indices is contiguous");
+    if let Some(dims) = dims {
+        if anti_transpose {
+            return Err(pyo3::exceptions::PyValueError::new_err(
+                "dims cannot be combined with anti_transpose",
+            ));
+        }
+        let dims = dims.as_slice().expect("dims is contiguous");
+        return Ok(pairings_with_dims(indptr, indices, dims, options));
+    }
+    if anti_transpose {
+        let num_cols = indptr.len() - 1;
+        let columns = anti_transpose_csr(indptr, indices)
+            .into_iter()
+            .map(|col| col.internal);
+        return Ok(decompose_and_diagram(columns, options).anti_transpose(num_cols));
+    }
+    Ok(decompose_and_diagram(columns_from_csr(indptr, indices), options))
 }
 
 /// A Python module implemented in Rust.
@@ -45,5 +224,42 @@ fn compute_pairings(matrix: &PyIterator) -> PersistenceDiagram {
 fn lophat(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(compute_pairings, m)?)?;
     m.add_function(wrap_pyfunction!(compute_pairings_serial, m)?)?;
+    m.add_function(wrap_pyfunction!(compute_pairings_csr, m)?)?;
+    m.add_class::<LoPhatOptions>()?;
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn dims_shortcut_agrees_with_reduction() {
+        let matrix: Vec<Vec<usize>> = vec![
+            vec![],
+            vec![],
+            vec![],
+            vec![],
+            vec![0, 1],
+            vec![0, 2],
+            vec![1, 2],
+            vec![0, 3],
+            vec![1, 3],
+            vec![2, 3],
+            vec![4, 7, 8],
+            vec![5, 7, 9],
+            vec![6, 8, 9],
+            vec![4, 5, 6],
+        ];
+        let dims: Vec<i32> = vec![0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2];
+        let mut indptr = vec![0i64];
+        let mut indices = vec![];
+        for col in &matrix {
+            indices.extend(col.iter().map(|&entry| entry as i32));
+            indptr.push(indices.len() as i64);
+        }
+        let expected = rv_decompose(matrix.into_iter().map(VecColumn::from)).diagram();
+        let computed = pairings_with_dims(&indptr, &indices, &dims, LoPhatOptions::default());
+        assert_eq!(computed, expected);
+    }
+}
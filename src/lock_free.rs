@@ -1,21 +1,27 @@
 use std::fmt::Debug;
 
 use crate::Column;
+use crate::LoPhatOptions;
 use crate::RVDecomposition;
 
-use crossbeam::atomic::AtomicCell;
 use pinboard::NonEmptyPinboard;
 use rayon::prelude::*;
+use std::sync::atomic::{AtomicUsize, Ordering};
+
+// Sentinel recorded in the pivot claim table when no column owns the pivot.
+// AtomicUsize always has lock-free compare_exchange, whereas an
+// AtomicCell<Option<usize>> is 16 bytes and falls back to a seqlock.
+const NO_PIVOT: usize = usize::MAX;
 
 // Implements do while loop lines 6-9
 fn get_col_with_pivot<C: Column>(
     l: usize,
     matrix: &Vec<NonEmptyPinboard<(C, C)>>,
-    pivots: &Vec<AtomicCell<Option<usize>>>,
+    pivots: &Vec<AtomicUsize>,
 ) -> Option<(usize, (C, C))> {
     loop {
-        let piv = pivots[l].load();
-        if let Some(piv) = piv {
+        let piv = pivots[l].load(Ordering::Relaxed);
+        if piv != NO_PIVOT {
             let cols = matrix[piv].read();
             if cols.0.pivot() != Some(l) {
                 // Got a column but it now has the wrong pivot; loop again.
@@ -33,7 +39,7 @@ fn get_col_with_pivot<C: Column>(
 fn reduce_column<C: Column>(
     j: usize,
     matrix: &Vec<NonEmptyPinboard<(C, C)>>,
-    pivots: &Vec<AtomicCell<Option<usize>>>,
+    pivots: &Vec<AtomicUsize>,
 ) {
     let mut working_j = j;
     'outer: loop {
@@ -48,7 +54,7 @@ fn reduce_column<C: Column>(
                 } else if piv > working_j {
                     matrix[working_j].set(curr_column);
                     if pivots[l]
-                        .compare_exchange(Some(piv), Some(working_j))
+                        .compare_exchange(piv, working_j, Ordering::Relaxed, Ordering::Relaxed)
                         .is_ok()
                     {
                         working_j = piv;
@@ -60,7 +66,10 @@ fn reduce_column<C: Column>(
             } else {
                 // piv = -1 case
                 matrix[working_j].set(curr_column);
-                if pivots[l].compare_exchange(None, Some(working_j)).is_ok() {
+                if pivots[l]
+                    .compare_exchange(NO_PIVOT, working_j, Ordering::Relaxed, Ordering::Relaxed)
+                    .is_ok()
+                {
                     return;
                 } else {
                     continue 'outer;
@@ -75,34 +84,93 @@ fn reduce_column<C: Column>(
     }
 }
 
+fn build_pivot_table(column_height: usize) -> Vec<AtomicUsize> {
+    (0..column_height).map(|_| AtomicUsize::new(NO_PIVOT)).collect()
+}
+
+// Fallback when cache-size detection is unavailable.
+const DEFAULT_L2_BYTES: usize = 256 * 1024;
+
+#[cfg(target_arch = "x86_64")]
+fn l2_cache_bytes() -> usize {
+    // Leaf 0x8000_0006 reports the L2 size in KiB in ECX[31:16] on both
+    // Intel and AMD.
+    // Safe on x86_64: cpuid is always available.
+    unsafe {
+        if std::arch::x86_64::__get_cpuid_max(0x8000_0000).0 >= 0x8000_0006 {
+            let l2_kib = (std::arch::x86_64::__cpuid(0x8000_0006).ecx >> 16) as usize;
+            if l2_kib > 0 {
+                return l2_kib * 1024;
+            }
+        }
+    }
+    DEFAULT_L2_BYTES
+}
+
+#[cfg(not(target_arch = "x86_64"))]
+fn l2_cache_bytes() -> usize {
+    DEFAULT_L2_BYTES
+}
+
 /// Decomposes the input matrix, using the lockfree, parallel algoirhtm of Morozov and Nigmetov.
 ///
 /// * `matrix` - iterator over columns of the matrix you wish to decompose.
-/// * `column_height` - an optional hint to the height of the columns.
-///   If `None`, assumed to be `matrix.collect().len()`.
-///   All indices must lie in the range `0..column_height`.
+/// * `options` - options controlling the number of threads, work-splitting
+///   and column height; see [`LoPhatOptions`].
 pub fn rv_decompose_lock_free<C: Column + Debug + 'static>(
     matrix: impl Iterator<Item = C>,
-    column_height: Option<usize>,
+    options: LoPhatOptions,
 ) -> RVDecomposition<C> {
+    let pool = rayon::ThreadPoolBuilder::new()
+        .num_threads(options.num_threads)
+        .build()
+        .expect("Failed to build thread pool");
+    // Building the pivot table is independent of collecting the columns
+    // whenever the column height is known up front, so kick it off on the
+    // pool while the calling thread consumes the iterator.
+    let pivots_rx = options.column_height.map(|height| {
+        let (tx, rx) = crossbeam::channel::bounded(1);
+        pool.spawn(move || {
+            let _ = tx.send(build_pivot_table(height));
+        });
+        rx
+    });
+    let mut col_bytes = 0;
     let matrix: Vec<_> = matrix
         .enumerate()
         .map(|(idx, r_col)| {
             let mut v_col = C::default();
             v_col.add_entry(idx);
+            col_bytes += r_col.mem_bytes() + v_col.mem_bytes();
             NonEmptyPinboard::new((r_col, v_col))
         })
         .collect();
-    let column_height = column_height.unwrap_or(matrix.len());
-    let pivots: Vec<_> = (0..column_height).map(|_| AtomicCell::new(None)).collect();
-    // Reduce matrix
-    // TODO: Can we advice rayon to split work in chunks?
-    (0..matrix.len())
-        .into_par_iter()
-        .for_each(|j| reduce_column(j, &matrix, &pivots));
-    // Wrap into RV decomposition
-    let (r, v) = matrix.into_iter().map(|pinboard| pinboard.read()).unzip();
-    RVDecomposition { r, v }
+    let pivots = match pivots_rx {
+        Some(rx) => rx.recv().expect("Pivot table builder panicked"),
+        None => build_pivot_table(matrix.len()),
+    };
+    let min_chunk_len = if options.auto_chunk {
+        // Size chunks so a chunk's R+V columns plus its share of the pivot
+        // table target half the L2; chunks past that thrash pivots out to
+        // LLC/DRAM on every lookup.
+        let per_col = col_bytes / matrix.len().max(1) + std::mem::size_of::<AtomicUsize>();
+        (l2_cache_bytes() / 2 / per_col.max(1)).max(1)
+    } else {
+        options.min_chunk_len.max(1)
+    };
+    pool.install(|| {
+        // Reduce matrix
+        (0..matrix.len())
+            .into_par_iter()
+            .with_min_len(min_chunk_len)
+            .for_each(|j| reduce_column(j, &matrix, &pivots));
+        // Wrap into RV decomposition
+        let (r, v) = matrix
+            .into_par_iter()
+            .map(|pinboard| pinboard.read())
+            .unzip();
+        RVDecomposition { r, v }
+    })
 }
 
 #[cfg(test)]
@@ -118,7 +186,8 @@ mod tests {
         #[test]
         fn lockfree_agrees_with_serial( matrix in sut_matrix(100) ) {
             let serial_dgm = rv_decompose(matrix.iter().cloned()).diagram();
-            let parallel_dgm = rv_decompose_lock_free(matrix.into_iter(), None).diagram();
+            let parallel_dgm =
+                rv_decompose_lock_free(matrix.into_iter(), LoPhatOptions::default()).diagram();
             assert_eq!(serial_dgm, parallel_dgm);
         }
     }
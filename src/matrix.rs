@@ -1,4 +1,5 @@
 use crate::Column;
+use crate::VecColumn;
 use rayon::prelude::IntoParallelIterator;
 
 pub trait Matrix<C: Column>: IntoIterator<Item = C> + IntoParallelIterator<Item = C> {
@@ -28,3 +29,80 @@ where
         self.len()
     }
 }
+
+/// Builds the columns of the anti-transpose of the square matrix provided in
+/// CSR format, i.e. entry `(i, j)` of the output is entry `(n-1-j, n-1-i)` of
+/// the input. The output is assembled directly from the CSR buffers with one
+/// counting pass and one scatter pass, rather than materializing the input
+/// columns and transposing them afterwards.
+///
+/// Decomposing the anti-transpose yields the same pairings as the original
+/// matrix, up to the re-indexing undone by
+/// [`PersistenceDiagram::anti_transpose`](crate::PersistenceDiagram::anti_transpose).
+pub fn anti_transpose_csr(indptr: &[i64], indices: &[i32]) -> Vec<VecColumn> {
+    let n = indptr.len() - 1;
+    let mut counts = vec![0usize; n];
+    for &row in indices {
+        counts[n - 1 - row as usize] += 1;
+    }
+    let mut columns: Vec<Vec<usize>> = counts
+        .iter()
+        .map(|&count| Vec::with_capacity(count))
+        .collect();
+    // Walk the input columns in reverse so that each output column receives
+    // its entries in increasing order.
+    for col in (0..n).rev() {
+        let col_range = (indptr[col] as usize)..(indptr[col + 1] as usize);
+        for &row in &indices[col_range] {
+            columns[n - 1 - row as usize].push(n - 1 - col);
+        }
+    }
+    columns.into_iter().map(VecColumn::from).collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::rv_decompose;
+
+    fn sphere_triangulation() -> Vec<Vec<usize>> {
+        vec![
+            vec![],
+            vec![],
+            vec![],
+            vec![],
+            vec![0, 1],
+            vec![0, 2],
+            vec![1, 2],
+            vec![0, 3],
+            vec![1, 3],
+            vec![2, 3],
+            vec![4, 7, 8],
+            vec![5, 7, 9],
+            vec![6, 8, 9],
+            vec![4, 5, 6],
+        ]
+    }
+
+    fn to_csr(matrix: &[Vec<usize>]) -> (Vec<i64>, Vec<i32>) {
+        let mut indptr = vec![0];
+        let mut indices = vec![];
+        for col in matrix {
+            indices.extend(col.iter().map(|&entry| entry as i32));
+            indptr.push(indices.len() as i64);
+        }
+        (indptr, indices)
+    }
+
+    #[test]
+    fn anti_transpose_csr_same_diagram() {
+        let matrix = sphere_triangulation();
+        let (indptr, indices) = to_csr(&matrix);
+        let n = matrix.len();
+        let direct_dgm = rv_decompose(matrix.into_iter().map(VecColumn::from)).diagram();
+        let at_dgm = rv_decompose(anti_transpose_csr(&indptr, &indices).into_iter())
+            .diagram()
+            .anti_transpose(n);
+        assert_eq!(direct_dgm, at_dgm);
+    }
+}
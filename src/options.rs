@@ -0,0 +1,55 @@
+use pyo3::prelude::*;
+
+/// Options controlling the decomposition algorithms.
+///
+/// * `num_threads` - number of threads the lockfree algorithm may use;
+///   `0` lets the thread pool choose (typically the number of cores).
+/// * `min_chunk_len` - minimum number of columns each parallel work item
+///   should cover; larger values reduce scheduling overhead.
+/// * `column_height` - an optional hint to the height of the columns.
+///   If `None`, assumed to be the number of columns.
+///   All indices must lie in the range `0..column_height`.
+/// * `auto_chunk` - ignore `min_chunk_len` and size work chunks so that each
+///   chunk's columns target half the L2 cache.
+#[pyclass]
+#[derive(Debug, Clone, Copy)]
+pub struct LoPhatOptions {
+    #[pyo3(get, set)]
+    pub num_threads: usize,
+    #[pyo3(get, set)]
+    pub min_chunk_len: usize,
+    #[pyo3(get, set)]
+    pub column_height: Option<usize>,
+    #[pyo3(get, set)]
+    pub auto_chunk: bool,
+}
+
+#[pymethods]
+impl LoPhatOptions {
+    #[new]
+    #[pyo3(signature = (num_threads=0, min_chunk_len=1, column_height=None, auto_chunk=false))]
+    fn new(
+        num_threads: usize,
+        min_chunk_len: usize,
+        column_height: Option<usize>,
+        auto_chunk: bool,
+    ) -> Self {
+        Self {
+            num_threads,
+            min_chunk_len,
+            column_height,
+            auto_chunk,
+        }
+    }
+}
+
+impl Default for LoPhatOptions {
+    fn default() -> Self {
+        Self {
+            num_threads: 0,
+            min_chunk_len: 1,
+            column_height: None,
+            auto_chunk: false,
+        }
+    }
+}
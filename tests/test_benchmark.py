@@ -0,0 +1,137 @@
+# Benchmarks comparing the per-column list interface with the batched CSR
+# interface, on the boundary matrix of a Rips filtration of a point cloud
+# sampled from a torus. Requires gudhi, numba and pytest-benchmark.
+
+import gudhi
+import numba
+import numpy as np
+
+from lophat import compute_pairings, compute_pairings_csr
+
+N_POINTS = 100
+MAX_DIM = 2
+MAX_EDGE_LENGTH = 0.6
+ROUNDS = 5
+
+
+def build_simplex_tree():
+    np.random.seed(42)
+    angles = np.random.uniform(0, 2 * np.pi, size=(N_POINTS, 2))
+    pts = np.stack(
+        [
+            (2 + np.cos(angles[:, 1])) * np.cos(angles[:, 0]),
+            (2 + np.cos(angles[:, 1])) * np.sin(angles[:, 0]),
+            np.sin(angles[:, 1]),
+        ],
+        axis=1,
+    )
+    rips = gudhi.RipsComplex(points=pts, max_edge_length=MAX_EDGE_LENGTH)
+    return rips.create_simplex_tree(max_dimension=MAX_DIM)
+
+
+s_tree2 = build_simplex_tree()
+idx_lookup = {
+    tuple(smplx): idx for idx, (smplx, _) in enumerate(s_tree2.get_filtration())
+}
+
+
+def get_sparse_boundary(smplx):
+    # A d-simplex has d+1 = len(smplx) boundary faces (vertices have none);
+    # sizing the array up front and sorting in C avoids a Python-level
+    # list build + list.sort per column.
+    arr = np.fromiter(
+        (idx_lookup[tuple(face)] for face, _ in s_tree2.get_boundaries(smplx)),
+        dtype=np.int32,
+        count=len(smplx) if len(smplx) > 1 else 0,
+    )
+    arr.sort()
+    return arr
+
+
+def rips_bdry_matrix():
+    # Preallocate and fill by index: the length is known up front, so there
+    # is no need to pay list.append's repeated realloc on growth.
+    matrix = [None] * s_tree2.num_simplices()
+    for idx, (smplx, _) in enumerate(s_tree2.get_filtration()):
+        matrix[idx] = get_sparse_boundary(smplx)
+    return matrix
+
+
+def collect_raw_boundaries():
+    # Single Python-level pass over the filtration; sorting and CSR assembly
+    # happen in the JIT'd kernel below.
+    n = s_tree2.num_simplices()
+    raw_lens = np.empty(n, dtype=np.int64)
+    flat = []
+    for idx, (smplx, _) in enumerate(s_tree2.get_filtration()):
+        faces = [idx_lookup[tuple(face)] for face, _ in s_tree2.get_boundaries(smplx)]
+        raw_lens[idx] = len(faces)
+        flat.extend(faces)
+    return raw_lens, np.asarray(flat, dtype=np.int32)
+
+
+@numba.njit(cache=True)
+def build_dims_indices(raw_lens, raw_boundaries):
+    n = raw_lens.shape[0]
+    dims = np.empty(n, dtype=np.int32)
+    indptr = np.empty(n + 1, dtype=np.int64)
+    indices = np.empty(raw_boundaries.shape[0], dtype=np.int32)
+    indptr[0] = 0
+    ptr = 0
+    for i in range(n):
+        col_len = raw_lens[i]
+        dims[i] = col_len - 1 if col_len > 0 else 0
+        for j in range(col_len):
+            # Insertion sort: boundary columns have at most dim+1 entries
+            entry = raw_boundaries[ptr + j]
+            k = j
+            while k > 0 and indices[ptr + k - 1] > entry:
+                indices[ptr + k] = indices[ptr + k - 1]
+                k -= 1
+            indices[ptr + k] = entry
+        ptr += col_len
+        indptr[i + 1] = ptr
+    return dims, indptr, indices
+
+
+# Built once at module load so benchmark setup hands out prebuilt inputs
+# and timings reflect the reduction, not gudhi marshalling.
+MATRIX = rips_bdry_matrix()
+DIMS, INDPTR, INDICES = build_dims_indices(*collect_raw_boundaries())
+
+
+def test_torus_iter(benchmark):
+    # setup runs every round: hand out a plain list iterator over the
+    # module-global matrix (cheaper than a generator object wrapping it,
+    # and nothing is rebuilt between rounds).
+    def setup():
+        return (iter(MATRIX),), {}
+
+    benchmark.pedantic(compute_pairings, setup=setup, rounds=ROUNDS)
+
+
+def test_torus_csr(benchmark):
+    benchmark.pedantic(compute_pairings_csr, args=(INDPTR, INDICES), rounds=ROUNDS)
+
+
+def test_torus_csr_dims(benchmark):
+    # With dims annotated, dim-0 pairings come from union-find and only
+    # the dim >= 2 block goes through matrix reduction.
+    benchmark.pedantic(
+        compute_pairings_csr,
+        args=(INDPTR, INDICES),
+        kwargs={"dims": DIMS},
+        rounds=ROUNDS,
+    )
+
+
+def test_csr_agrees_with_iter():
+    dgm_iter = compute_pairings(iter(MATRIX))
+    dgm_csr = compute_pairings_csr(INDPTR, INDICES)
+    dgm_dims = compute_pairings_csr(INDPTR, INDICES, dims=DIMS)
+    # The array views are sorted on the Rust side, so the compares are
+    # vectorized rather than boxing every pair back into Python tuples.
+    assert np.array_equal(dgm_iter.paired_array, dgm_csr.paired_array)
+    assert np.array_equal(dgm_iter.unpaired_array, dgm_csr.unpaired_array)
+    assert np.array_equal(dgm_iter.paired_array, dgm_dims.paired_array)
+    assert np.array_equal(dgm_iter.unpaired_array, dgm_dims.unpaired_array)
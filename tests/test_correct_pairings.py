@@ -0,0 +1,170 @@
+# Cross-checks the Rust reduction against an independent numba-compiled
+# mod-2 column reduction operating on the CSR form of the matrix.
+
+import numba
+import numpy as np
+
+from lophat import compute_pairings_csr
+
+SPHERE_TRIANGULATION = [
+    [],
+    [],
+    [],
+    [],
+    [0, 1],
+    [0, 2],
+    [1, 2],
+    [0, 3],
+    [1, 3],
+    [2, 3],
+    [4, 7, 8],
+    [5, 7, 9],
+    [6, 8, 9],
+    [4, 5, 6],
+]
+
+
+def to_csr(matrix):
+    indptr = np.zeros(len(matrix) + 1, dtype=np.int64)
+    flat = []
+    for j, col in enumerate(matrix):
+        flat.extend(col)
+        indptr[j + 1] = len(flat)
+    return indptr, np.asarray(flat, dtype=np.int32)
+
+
+@numba.njit(cache=True)
+def _xor_merge(left, right):
+    out = np.empty(left.shape[0] + right.shape[0], np.int32)
+    i = j = k = 0
+    while i < left.shape[0] and j < right.shape[0]:
+        if left[i] < right[j]:
+            out[k] = left[i]
+            i += 1
+            k += 1
+        elif left[i] > right[j]:
+            out[k] = right[j]
+            j += 1
+            k += 1
+        else:
+            # Equal entries cancel over F_2
+            i += 1
+            j += 1
+    while i < left.shape[0]:
+        out[k] = left[i]
+        i += 1
+        k += 1
+    while j < right.shape[0]:
+        out[k] = right[j]
+        j += 1
+        k += 1
+    return out[:k]
+
+
+@numba.njit(cache=True)
+def reduce_mod2(indptr, indices, n):
+    # Standard left-to-right reduction, kept deliberately simple so it can
+    # serve as an independent reference for the Rust implementations.
+    pivot_of_row = np.full(n, -1, np.int64)
+    reduced = [np.empty(0, np.int32) for _ in range(0)]
+    paired = np.empty((n, 2), np.int64)
+    n_paired = 0
+    for j in range(n):
+        current = indices[indptr[j] : indptr[j + 1]].copy()
+        while current.shape[0] > 0:
+            low = current[current.shape[0] - 1]
+            owner = pivot_of_row[low]
+            if owner == -1:
+                break
+            current = _xor_merge(current, reduced[owner])
+        reduced.append(current)
+        if current.shape[0] > 0:
+            low = current[current.shape[0] - 1]
+            pivot_of_row[low] = j
+            paired[n_paired, 0] = low
+            paired[n_paired, 1] = j
+            n_paired += 1
+    unpaired_mask = np.ones(n, np.bool_)
+    for k in range(n_paired):
+        unpaired_mask[paired[k, 0]] = False
+        unpaired_mask[paired[k, 1]] = False
+    return paired[:n_paired], np.nonzero(unpaired_mask)[0]
+
+
+@numba.njit(cache=True)
+def _reduce_block(indptr, indices, dims, block_dim, paired_low):
+    # Serial left-to-right reduction restricted to one dimension block;
+    # records paired_low[j] = low(j) for each death column j in the block.
+    n = dims.shape[0]
+    pivot_of_row = np.full(n, -1, np.int64)
+    reduced = [np.empty(0, np.int32) for _ in range(0)]
+    for j in range(n):
+        if dims[j] != block_dim:
+            continue
+        current = indices[indptr[j] : indptr[j + 1]].copy()
+        while current.shape[0] > 0:
+            low = current[current.shape[0] - 1]
+            owner = pivot_of_row[low]
+            if owner == -1:
+                break
+            current = _xor_merge(current, reduced[owner])
+        if current.shape[0] > 0:
+            low = current[current.shape[0] - 1]
+            pivot_of_row[low] = len(reduced)
+            reduced.append(current)
+            paired_low[j] = low
+    return paired_low
+
+
+@numba.njit(parallel=True, cache=True)
+def reduce_mod2_dim_blocks(indptr, indices, dims):
+    # Dimension blocks are independent (a dim-d pivot lies in a (d-1)-cell
+    # row, which no other dimension's column can claim), so this is the only
+    # loop worth a prange: per-column parallelism fights the left-to-right
+    # dependency of the reduction and just oversubscribes.
+    n = dims.shape[0]
+    paired_low = np.full(n, -1, np.int64)
+    max_dim = np.max(dims)
+    for block_dim in numba.prange(max_dim + 1):
+        _reduce_block(indptr, indices, dims, block_dim, paired_low)
+    return paired_low
+
+
+def assert_agrees(matrix):
+    indptr, indices = to_csr(matrix)
+    paired, unpaired = reduce_mod2(indptr, indices, len(matrix))
+    dgm = compute_pairings_csr(indptr, indices)
+    # The diagram's array views are lexicographically sorted, so after
+    # sorting the reference output the compare is fully vectorized.
+    if paired.shape[0]:
+        paired = paired[np.lexsort((paired[:, 1], paired[:, 0]))]
+    assert np.array_equal(dgm.paired_array, paired)
+    assert np.array_equal(dgm.unpaired_array, np.sort(unpaired))
+
+
+def test_sphere_triangulation_agrees():
+    assert_agrees(SPHERE_TRIANGULATION)
+
+
+def test_sphere_dim_blocks_agree():
+    indptr, indices = to_csr(SPHERE_TRIANGULATION)
+    dims = np.array([0] * 4 + [1] * 6 + [2] * 4, dtype=np.int64)
+    paired_low = reduce_mod2_dim_blocks(indptr, indices, dims)
+    deaths = np.nonzero(paired_low != -1)[0]
+    paired = np.stack([paired_low[deaths], deaths], axis=1)
+    paired = paired[np.lexsort((paired[:, 1], paired[:, 0]))]
+    unpaired_mask = np.ones(len(paired_low), dtype=bool)
+    unpaired_mask[deaths] = False
+    unpaired_mask[paired_low[deaths]] = False
+    dgm = compute_pairings_csr(indptr, indices)
+    assert np.array_equal(dgm.paired_array, paired)
+    assert np.array_equal(dgm.unpaired_array, np.nonzero(unpaired_mask)[0])
+
+
+def test_random_matrix_agrees():
+    rng = np.random.default_rng(0)
+    matrix = [[]] + [
+        sorted(rng.choice(j, size=rng.integers(0, j + 1), replace=False).tolist())
+        for j in range(1, 60)
+    ]
+    assert_agrees(matrix)
@@ -0,0 +1,114 @@
+# Rough timing comparison between the per-column list interface and the
+# batched CSR interface, on the boundary matrix of a Rips filtration of a
+# point cloud sampled from a torus.
+
+from time import time
+
+import gudhi
+import numpy as np
+
+from lophat import LoPhatOptions, compute_pairings, compute_pairings_csr
+
+N_POINTS = 100
+MAX_DIM = 2
+MAX_EDGE_LENGTH = 0.6
+N_RUNS = 5
+CHUNK_SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+def build_simplex_tree():
+    np.random.seed(42)
+    angles = np.random.uniform(0, 2 * np.pi, size=(N_POINTS, 2))
+    pts = np.stack(
+        [
+            (2 + np.cos(angles[:, 1])) * np.cos(angles[:, 0]),
+            (2 + np.cos(angles[:, 1])) * np.sin(angles[:, 0]),
+            np.sin(angles[:, 1]),
+        ],
+        axis=1,
+    )
+    rips = gudhi.RipsComplex(points=pts, max_edge_length=MAX_EDGE_LENGTH)
+    return rips.create_simplex_tree(max_dimension=MAX_DIM)
+
+
+s_tree2 = build_simplex_tree()
+idx_lookup = {
+    tuple(smplx): idx for idx, (smplx, _) in enumerate(s_tree2.get_filtration())
+}
+
+
+def get_sparse_boundary(smplx):
+    # A d-simplex has d+1 = len(smplx) boundary faces (vertices have none);
+    # sizing the array up front and sorting in C avoids a Python-level
+    # list build + list.sort per column.
+    arr = np.fromiter(
+        (idx_lookup[tuple(face)] for face, _ in s_tree2.get_boundaries(smplx)),
+        dtype=np.int32,
+        count=len(smplx) if len(smplx) > 1 else 0,
+    )
+    arr.sort()
+    return arr
+
+
+def rips_bdry_matrix():
+    # Batched CSR layout: one pass over the filtration filling preallocated
+    # arrays, so the whole matrix crosses the FFI boundary as two buffers.
+    n = s_tree2.num_simplices()
+    nnz = sum(len(smplx) for smplx, _ in s_tree2.get_filtration() if len(smplx) > 1)
+    indptr = np.empty(n + 1, dtype=np.int64)
+    indices = np.empty(nnz, dtype=np.int32)
+    indptr[0] = 0
+    ptr = 0
+    for idx, (smplx, _) in enumerate(s_tree2.get_filtration()):
+        for face_idx in get_sparse_boundary(smplx):
+            indices[ptr] = face_idx
+            ptr += 1
+        indptr[idx + 1] = ptr
+    return indptr, indices
+
+
+def time_fn(fn):
+    start = time()
+    fn()
+    return time() - start
+
+
+def main():
+    print(f"Simplices: {s_tree2.num_simplices()}")
+    indptr, indices = rips_bdry_matrix()
+    list_times = []
+    csr_times = []
+    csr_at_times = []
+    for _ in range(N_RUNS):
+        matrix = (
+            get_sparse_boundary(smplx) for smplx, _ in s_tree2.get_filtration()
+        )
+        list_times.append(time_fn(lambda: compute_pairings(matrix)))
+        csr_times.append(time_fn(lambda: compute_pairings_csr(indptr, indices)))
+        csr_at_times.append(
+            time_fn(lambda: compute_pairings_csr(indptr, indices, anti_transpose=True))
+        )
+    print(f"List interface:      {min(list_times):.4f}s")
+    print(f"CSR interface:       {min(csr_times):.4f}s")
+    print(f"CSR anti-transpose:  {min(csr_at_times):.4f}s")
+    # The sweep reuses the prebuilt CSR buffers (nothing is consumed), so it
+    # times the reducer rather than re-walking the simplex tree every run.
+    print("min_chunk_len sweep:")
+    for chunk_len in CHUNK_SIZES:
+        opts = LoPhatOptions(min_chunk_len=chunk_len)
+        times = []
+        for _ in range(N_RUNS):
+            times.append(
+                time_fn(lambda: compute_pairings_csr(indptr, indices, opts))
+            )
+        print(f"  min_chunk_len={chunk_len}: {min(times):.4f}s")
+    opts = LoPhatOptions(auto_chunk=True)
+    times = [
+        time_fn(lambda: compute_pairings_csr(indptr, indices, opts))
+        for _ in range(N_RUNS)
+    ]
+    print(f"  auto_chunk: {min(times):.4f}s")
+
+
+if __name__ == "__main__":
+    main()